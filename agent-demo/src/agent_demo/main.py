@@ -2,17 +2,41 @@
 Demo agent using the agent-sdk.
 
 This is a mock implementation that simulates calling the llmproxy streaming interface
-and prints the SSE response format.
+and logs the SSE response format at DEBUG level.
 """
 
 import asyncio
-import json
+import logging
+import os
 import time
-import uuid
 from collections.abc import AsyncIterator
 
+import orjson
 from agent_sdk import Agent, InvokeContext, SSEResponse, Usage
 
+logger = logging.getLogger(__name__)
+
+_MODEL = "mock-gpt-4"
+
+# Static parts of the mock chat.completion.chunk payloads; only id/created/model
+# (and the per-chunk content) vary, so the rest is serialized once here.
+_FIRST_CHUNK = (
+    'data: {"id":"%s","object":"chat.completion.chunk","created":%d,"model":"%s",'
+    '"choices":[{"index":0,"delta":{"role":"assistant","content":""},"finish_reason":null}]}'
+)
+_FINAL_CHUNK = (
+    'data: {"id":"%s","object":"chat.completion.chunk","created":%d,"model":"%s",'
+    '"choices":[{"index":0,"delta":{},"finish_reason":"stop"}]}'
+)
+_CHUNK_SUFFIX = '},"finish_reason":null}]}'
+
+# Mock reply is this prefix followed by the user input
+_RESPONSE_PREFIX = "This is a mock LLM response for: "
+_RESPONSE_PREFIX_TOKENS = len(_RESPONSE_PREFIX.split())
+
+# Artificial pacing between chunks, off by default so the demo streams at wire speed.
+_STREAM_DELAY = float(os.environ.get("DEMO_STREAM_DELAY_MS", "0")) / 1000.0
+
 
 class DemoAgent(Agent):
     """
@@ -27,79 +51,59 @@ class DemoAgent(Agent):
             capabilities=["streaming", "llm-mock"],
         )
 
-    async def invoke(self, ctx: InvokeContext) -> AsyncIterator[str]:
+    async def invoke(self, ctx: InvokeContext) -> AsyncIterator[bytes]:
         """Handle an invocation request, simulating llmproxy SSE streaming."""
-        # Print the incoming request
-        print("\n" + "=" * 60)
-        print("INCOMING REQUEST:")
-        print(f"  run_id: {ctx.run_id}")
-        print(f"  input: {ctx.input_message.content}")
-        print("=" * 60)
+        debug = logger.isEnabledFor(logging.DEBUG)
+        logger.debug("INCOMING REQUEST: run_id=%s input=%s", ctx.run_id, ctx.input_message.content)
 
         sse = SSEResponse(run_id=ctx.run_id)
         user_input = ctx.input_message.content
 
         # Mock response content
-        response_content = f"This is a mock LLM response for: {user_input}"
-        chunk_id = f"chatcmpl-{uuid.uuid4().hex[:8]}"
-        created = int(time.time())
-        model = "mock-gpt-4"
-
-        print("\n[Mock llmproxy /v1/chat/completions SSE stream]")
-        print("-" * 60)
-
-        # First chunk with role
-        first_chunk = {
-            "id": chunk_id,
-            "object": "chat.completion.chunk",
-            "created": created,
-            "model": model,
-            "choices": [{"index": 0, "delta": {"role": "assistant", "content": ""}, "finish_reason": None}],
-        }
-        print(f"data: {json.dumps(first_chunk)}\n")
-
-        # Stream content chunks
-        chunk_size = 5
-        delay = 0.03
-        full_text = ""
+        response_content = _RESPONSE_PREFIX + user_input
+
+        if debug:
+            # Only the debug trace needs a completion id; 4 random bytes is
+            # plenty for a mock and much cheaper than a full uuid4.
+            chunk_id = f"chatcmpl-{os.urandom(4).hex()}"
+            created = int(time.time())
+            # Mock llmproxy /v1/chat/completions SSE stream; content chunks
+            # share everything but the delta text
+            logger.debug(_FIRST_CHUNK, chunk_id, created, _MODEL)
+            chunk_prefix = (
+                f'data: {{"id":"{chunk_id}","object":"chat.completion.chunk","created":{created},'
+                f'"model":"{_MODEL}","choices":[{{"index":0,"delta":{{"content":'
+            )
+
+        # Stream content chunks; large enough to keep the frame count down,
+        # small enough that even a short reply arrives as several deltas
+        chunk_size = 16
+        started = time.monotonic()
 
         for i in range(0, len(response_content), chunk_size):
             chunk_text = response_content[i : i + chunk_size]
-            full_text += chunk_text
-
-            stream_chunk = {
-                "id": chunk_id,
-                "object": "chat.completion.chunk",
-                "created": created,
-                "model": model,
-                "choices": [{"index": 0, "delta": {"content": chunk_text}, "finish_reason": None}],
-            }
-            print(f"data: {json.dumps(stream_chunk)}\n")
+            if debug:
+                logger.debug(
+                    "%s%s%s", chunk_prefix, orjson.dumps(chunk_text).decode(), _CHUNK_SUFFIX
+                )
             yield sse.delta(chunk_text)
-            await asyncio.sleep(delay)
+            await asyncio.sleep(_STREAM_DELAY)
 
         # Final chunk with finish_reason
-        final_chunk = {
-            "id": chunk_id,
-            "object": "chat.completion.chunk",
-            "created": created,
-            "model": model,
-            "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
-        }
-        print(f"data: {json.dumps(final_chunk)}\n")
-        print("data: [DONE]\n")
-        print("-" * 60)
-
-        # Usage stats
+        if debug:
+            logger.debug(_FINAL_CHUNK, chunk_id, created, _MODEL)
+            logger.debug("data: [DONE]")
+
+        # Usage stats; the reply embeds the prompt, so count its words only once
         prompt_tokens = len(user_input.split())
-        completion_tokens = len(response_content.split())
+        completion_tokens = _RESPONSE_PREFIX_TOKENS + prompt_tokens
         usage = Usage(
             tokens=prompt_tokens + completion_tokens,
             prompt_tokens=prompt_tokens,
             completion_tokens=completion_tokens,
-            duration_ms=int((len(response_content) / chunk_size) * delay * 1000),
+            duration_ms=int((time.monotonic() - started) * 1000),
         )
-        yield sse.done(final_message=full_text, usage=usage)
+        yield sse.done(final_message=response_content, usage=usage)
 
 
 # Create the agent instance
@@ -111,6 +115,7 @@ app = agent.create_app()
 
 def run():
     """Run the agent server."""
+    logging.basicConfig(level=os.environ.get("DEMO_LOG_LEVEL", "INFO").upper())
     agent.run(port=8000)
 
 
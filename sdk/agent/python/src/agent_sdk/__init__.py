@@ -59,7 +59,16 @@ from .models import (
     StateEvent,
     Usage,
 )
-from .sse import SSEResponse, format_sse_event, stream_text, stream_text_sync
+from .sse import (
+    SSEResponse,
+    format_sse_event,
+    sse_delta,
+    sse_done,
+    sse_error,
+    sse_state,
+    stream_text,
+    stream_text_sync,
+)
 
 __version__ = "0.1.0"
 
@@ -93,6 +102,10 @@ __all__ = [
     # SSE Utilities
     "SSEResponse",
     "format_sse_event",
+    "sse_delta",
+    "sse_state",
+    "sse_done",
+    "sse_error",
     "stream_text",
     "stream_text_sync",
 ]
@@ -0,0 +1,36 @@
+"""
+JSON encoding helpers for the SSE hot path.
+
+orjson is used when it is installed (``agent-sdk[speedups]``); otherwise the
+standard library is used with equivalent compact, non-ASCII-escaped output.
+"""
+
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+if orjson is not None:
+
+    def dumps(obj: Any) -> bytes:
+        """Serialize obj to UTF-8 encoded JSON."""
+        # Stringify non-str dict keys the way the stdlib fallback does
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+
+    def loads(data: Union[bytes, str]) -> Any:
+        """Deserialize JSON from bytes or str."""
+        return orjson.loads(data)
+
+else:
+
+    def dumps(obj: Any) -> bytes:
+        """Serialize obj to UTF-8 encoded JSON."""
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode()
+
+    def loads(data: Union[bytes, str]) -> Any:
+        """Deserialize JSON from bytes or str."""
+        return json.loads(data)
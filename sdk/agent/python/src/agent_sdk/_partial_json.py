@@ -0,0 +1,253 @@
+"""
+Incremental JSON parsing for streamed documents.
+
+Used to follow tool-call arguments that an LLM streams as JSON text, one
+fragment per chunk, without re-parsing the accumulated text each time.
+"""
+
+from typing import Any, Optional
+
+from ._json import loads
+
+# States of PartialJSONParser
+_VALUE = 0  # expecting a value
+_VALUE_OR_END = 1  # after "[": a value or "]"
+_KEY_OR_END = 2  # after "{": a key or "}"
+_KEY = 3  # after "," in an object: a key
+_COLON = 4  # after a key
+_AFTER_VALUE = 5  # expecting "," or a closing bracket
+_STRING = 6  # inside a string
+_SCALAR = 7  # inside a number or literal
+
+_WS = " \t\r\n"
+_ESCAPES = {
+    '"': '"',
+    "\\": "\\",
+    "/": "/",
+    "b": "\b",
+    "f": "\f",
+    "n": "\n",
+    "r": "\r",
+    "t": "\t",
+}
+
+
+class PartialJSONParser:
+    """
+    Push parser that builds a JSON value as its text arrives.
+
+    Each fragment passed to `feed` is scanned once, so feeding a growing
+    document costs O(total length) rather than re-parsing the whole prefix on
+    every fragment. `value` holds what has been built so far: containers are
+    filled in place, a string value shows the characters received so far, and
+    an unfinished number or literal is left out until it completes.
+
+    A string that is still arriving is only joined when `value` is read, at a
+    cost proportional to its current length. Reading `value` after every
+    fragment of one very long string is therefore still quadratic in that
+    string's length; everything else stays linear.
+    """
+
+    __slots__ = (
+        "_value",
+        "_stale",
+        "_stack",
+        "_state",
+        "_parts",
+        "_in_key",
+        "_escape",
+        "_surrogates",
+        "_scalar",
+        "_slot",
+    )
+
+    def __init__(self) -> None:
+        self._value: Any = None
+        # Whether the string being read has content not yet stored in _value
+        self._stale = False
+        # [container, current key] for each open object/array
+        self._stack: list[list[Any]] = []
+        self._state = _VALUE
+        self._parts: list[str] = []
+        self._in_key = False
+        # None outside an escape, "" right after a backslash, "u..." in a \u escape
+        self._escape: Optional[str] = None
+        self._surrogates = False
+        self._scalar = ""
+        # (container, key) the string being read is stored under; None for the root
+        self._slot: Optional[tuple[Any, Any]] = None
+
+    def feed(self, text: str) -> None:
+        """
+        Consume the next fragment of the document.
+
+        Raises:
+            ValueError: If the text is not a valid JSON prefix
+        """
+        i = 0
+        n = len(text)
+        while i < n:
+            state = self._state
+            if state == _STRING:
+                i = self._read_string(text, i)
+                continue
+            ch = text[i]
+            if state == _SCALAR:
+                if ch in ",]}" or ch in _WS:
+                    # Completes the scalar; the delimiter is handled next round
+                    self._attach(loads(self._scalar))
+                    self._scalar = ""
+                    self._state = _AFTER_VALUE
+                else:
+                    self._scalar += ch
+                    i += 1
+                continue
+            i += 1
+            if ch in _WS:
+                continue
+
+            if state == _VALUE_OR_END:
+                if ch == "]":
+                    self._close()
+                    continue
+                state = _VALUE
+
+            if state == _VALUE:
+                if ch == "{":
+                    self._open({}, _KEY_OR_END)
+                elif ch == "[":
+                    self._open([], _VALUE_OR_END)
+                elif ch == '"':
+                    self._in_key = False
+                    self._slot = self._attach("")
+                    self._state = _STRING
+                elif ch in "-0123456789tfn":
+                    self._scalar = ch
+                    self._state = _SCALAR
+                else:
+                    raise ValueError(f"unexpected {ch!r} where a JSON value was expected")
+            elif state == _KEY_OR_END or state == _KEY:
+                if ch == '"':
+                    self._in_key = True
+                    self._state = _STRING
+                elif ch == "}" and state == _KEY_OR_END:
+                    self._close()
+                else:
+                    raise ValueError(f"unexpected {ch!r} where an object key was expected")
+            elif state == _COLON:
+                if ch != ":":
+                    raise ValueError(f"unexpected {ch!r} where ':' was expected")
+                self._state = _VALUE
+            else:  # _AFTER_VALUE
+                if not self._stack:
+                    raise ValueError(f"unexpected {ch!r} after the end of the JSON value")
+                is_object = isinstance(self._stack[-1][0], dict)
+                if ch == ",":
+                    self._state = _KEY if is_object else _VALUE
+                elif ch == ("}" if is_object else "]"):
+                    self._close()
+                else:
+                    raise ValueError(f"unexpected {ch!r} after a JSON value")
+
+        if self._state == _STRING and not self._in_key:
+            self._stale = True
+
+    @property
+    def value(self) -> Any:
+        """The value built so far."""
+        if self._stale:
+            # Store the string read so far, keeping it as the single part to extend
+            partial = "".join(self._parts)
+            self._parts = [partial]
+            self._store(partial)
+            self._stale = False
+        return self._value
+
+    def _read_string(self, text: str, i: int) -> int:
+        """Read string content from text[i:]; return the index to resume at."""
+        parts = self._parts
+        n = len(text)
+        while i < n:
+            escape = self._escape
+            if escape is not None:
+                ch = text[i]
+                i += 1
+                if escape == "":
+                    if ch == "u":
+                        self._escape = "u"
+                        continue
+                    try:
+                        parts.append(_ESCAPES[ch])
+                    except KeyError:
+                        raise ValueError(f"invalid escape '\\{ch}' in JSON string") from None
+                    self._escape = None
+                else:
+                    escape += ch
+                    if len(escape) < 5:
+                        self._escape = escape
+                        continue
+                    codepoint = int(escape[1:], 16)
+                    if 0xD800 <= codepoint <= 0xDFFF:
+                        self._surrogates = True
+                    parts.append(chr(codepoint))
+                    self._escape = None
+                continue
+
+            quote = text.find('"', i)
+            backslash = text.find("\\", i, n if quote < 0 else quote)
+            if backslash >= 0:
+                parts.append(text[i:backslash])
+                self._escape = ""
+                i = backslash + 1
+            elif quote < 0:
+                parts.append(text[i:])
+                return n
+            else:
+                parts.append(text[i:quote])
+                self._finish_string()
+                return quote + 1
+        return i
+
+    def _finish_string(self) -> None:
+        value = "".join(self._parts)
+        self._parts = []
+        if self._surrogates:
+            # Recombine surrogate pairs sent as two \u escapes
+            value = value.encode("utf-16", "surrogatepass").decode("utf-16")
+            self._surrogates = False
+        if self._in_key:
+            self._stack[-1][1] = value
+            self._state = _COLON
+        else:
+            self._store(value)
+            self._stale = False
+            self._slot = None
+            self._state = _AFTER_VALUE
+
+    def _attach(self, value: Any) -> Optional[tuple[Any, Any]]:
+        """Add a value to the open container (or make it the root); return its slot."""
+        if not self._stack:
+            self._value = value
+            return None
+        container, key = self._stack[-1]
+        if isinstance(container, list):
+            container.append(value)
+            return container, len(container) - 1
+        container[key] = value
+        return container, key
+
+    def _store(self, value: str) -> None:
+        if self._slot is None:
+            self._value = value
+        else:
+            container, key = self._slot
+            container[key] = value
+
+    def _open(self, container: Any, state: int) -> None:
+        self._attach(container)
+        self._stack.append([container, None])
+        self._state = state
+
+    def _close(self) -> None:
+        self._stack.pop()
+        self._state = _AFTER_VALUE
@@ -13,13 +13,41 @@ from contextlib import asynccontextmanager
 from typing import Any, Callable, Optional
 
 from fastapi import FastAPI, Request
-from fastapi.responses import StreamingResponse
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 
+from . import _json
 from .models import AgentInfo, HealthResponse, InvokeContext, InvokeRequest
 from .sse import SSEResponse
 
+try:
+    from sse_starlette.sse import EventSourceResponse
+except ImportError:
+    EventSourceResponse = None
+
 logger = logging.getLogger(__name__)
 
+# Keep-alive comment interval for /invoke streams (sse-starlette only)
+SSE_PING_INTERVAL = 15
+
+
+async def _encode_frames(events: AsyncIterator[Any]) -> AsyncIterator[bytes]:
+    """
+    Encode str frames to bytes for EventSourceResponse.
+
+    sse-starlette only passes bytes through verbatim; a str is treated as the
+    data of a new event and framed again. Only used for agents that set
+    `str_frames`, since it adds a generator hop per event.
+    """
+    async for event in events:
+        yield event.encode() if isinstance(event, str) else event
+
+
+class _JSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson when installed (see `_json`)."""
+
+    def render(self, content: Any) -> bytes:
+        return _json.dumps(content)
+
 
 class Agent(ABC):
     """
@@ -31,7 +59,7 @@ class Agent(ABC):
     Example:
         ```python
         class EchoAgent(Agent):
-            async def invoke(self, ctx: InvokeContext) -> AsyncIterator[str]:
+            async def invoke(self, ctx: InvokeContext) -> AsyncIterator[bytes]:
                 sse = SSEResponse(run_id=ctx.run_id)
                 text = f"You said: {ctx.input_message.content}"
 
@@ -51,6 +79,10 @@ class Agent(ABC):
         ```
     """
 
+    # Set to True if invoke yields pre-framed SSE events as str rather than
+    # bytes; they are then encoded before sending, one extra hop per event.
+    str_frames: bool = False
+
     def __init__(
         self,
         agent_id: str,
@@ -74,17 +106,18 @@ class Agent(ABC):
         self._app: Optional[FastAPI] = None
 
     @abstractmethod
-    async def invoke(self, ctx: InvokeContext) -> AsyncIterator[str]:
+    async def invoke(self, ctx: InvokeContext) -> AsyncIterator[bytes]:
         """
         Handle an invocation request.
 
         This is the main method you need to implement. It receives the
-        invocation context and should yield SSE-formatted event strings.
+        invocation context and should yield SSE-formatted events as bytes
+        (or as str if the agent sets `str_frames`).
 
         Use the SSEResponse helper to create properly formatted events:
 
         ```python
-        async def invoke(self, ctx: InvokeContext) -> AsyncIterator[str]:
+        async def invoke(self, ctx: InvokeContext) -> AsyncIterator[bytes]:
             sse = SSEResponse(run_id=ctx.run_id)
             yield sse.delta("Hello")
             yield sse.done(final_message="Hello")
@@ -94,9 +127,9 @@ class Agent(ABC):
             ctx: The invocation context containing the request data
 
         Yields:
-            SSE-formatted event strings
+            SSE-formatted event bytes
         """
-        yield ""  # Make this a generator for type checking
+        yield b""  # Make this a generator for type checking
 
     async def on_startup(self) -> None:
         """
@@ -132,6 +165,79 @@ class Agent(ABC):
             capabilities=self.capabilities,
         )
 
+    async def _health_check(self) -> HealthResponse:
+        """GET /health route handler."""
+        return self.get_health()
+
+    async def _invoke_handler(self, request: Request, body: InvokeRequest) -> Response:
+        """POST /invoke route handler; streams the agent's SSE events."""
+        # Pick up tracing and X- prefixed id overrides in a single pass over
+        # the raw ASGI headers (already lower-cased by the server). Like
+        # request.headers.get, the first of any repeated header wins.
+        traceparent = None
+        platform_base_url = None
+        session_id = None
+        run_id = None
+        for key, value in request.scope["headers"]:
+            if key == b"traceparent":
+                if traceparent is None:
+                    traceparent = value.decode("latin-1")
+            elif key == b"x-platform-base-url":
+                if platform_base_url is None:
+                    platform_base_url = value.decode("latin-1")
+            elif key == b"x-session-id":
+                if session_id is None:
+                    session_id = value.decode("latin-1")
+            elif key == b"x-run-id":
+                if run_id is None:
+                    run_id = value.decode("latin-1")
+        if session_id is not None:
+            body.session_id = session_id
+        if run_id is not None:
+            body.run_id = run_id
+
+        # Create context
+        ctx = InvokeContext.from_request(
+            body,
+            traceparent=traceparent,
+            platform_base_url=platform_base_url,
+        )
+
+        logger.info(f"[invoke] session_id={ctx.session_id}, run_id={ctx.run_id}")
+        logger.debug(f"[invoke] input: {ctx.input_message.content}")
+
+        events = self.invoke(ctx)
+
+        # sse-starlette passes our pre-framed bytes through untouched and adds
+        # keep-alive pings so idle streams survive proxy timeouts.
+        if EventSourceResponse is not None:
+            if self.str_frames:
+                events = _encode_frames(events)
+            return EventSourceResponse(events, ping=SSE_PING_INTERVAL)
+
+        return StreamingResponse(
+            events,
+            media_type="text/event-stream",
+            headers={
+                "Cache-Control": "no-cache",
+                "Connection": "keep-alive",
+                "X-Accel-Buffering": "no",
+            },
+        )
+
+    async def _root(self):
+        """GET / route handler with service info."""
+        return {
+            "agent_id": self.agent_id,
+            "name": self.name,
+            "version": self.version,
+            "capabilities": self.capabilities,
+            "endpoints": {
+                "/health": "Health check (GET)",
+                "/invoke": "Agent invocation (POST)",
+            },
+        }
+
     def create_app(self) -> FastAPI:
         """
         Create a FastAPI application for this agent.
@@ -155,60 +261,14 @@ class Agent(ABC):
             description=f"Agent: {self.name}",
             version=self.version,
             lifespan=lifespan,
+            default_response_class=_JSONResponse,
         )
 
-        @app.get("/health", response_model=HealthResponse)
-        async def health_check():
-            return self.get_health()
-
-        @app.post("/invoke")
-        async def invoke_handler(request: Request, body: InvokeRequest):
-            # Extract headers
-            traceparent = request.headers.get("traceparent")
-            platform_base_url = request.headers.get("x-platform-base-url")
-
-            # Also check X- prefixed headers
-            session_id = request.headers.get("X-Session-ID", body.session_id)
-            run_id = request.headers.get("X-Run-ID", body.run_id)
-
-            # Update body with header values if present
-            if session_id != body.session_id:
-                body.session_id = session_id
-            if run_id != body.run_id:
-                body.run_id = run_id
-
-            # Create context
-            ctx = InvokeContext.from_request(
-                body,
-                traceparent=traceparent,
-                platform_base_url=platform_base_url,
-            )
-
-            logger.info(f"[invoke] session_id={ctx.session_id}, run_id={ctx.run_id}")
-            logger.debug(f"[invoke] input: {ctx.input_message.content}")
-
-            return StreamingResponse(
-                self.invoke(ctx),
-                media_type="text/event-stream",
-                headers={
-                    "Cache-Control": "no-cache",
-                    "Connection": "keep-alive",
-                    "X-Accel-Buffering": "no",
-                },
-            )
-
-        @app.get("/")
-        async def root():
-            return {
-                "agent_id": self.agent_id,
-                "name": self.name,
-                "version": self.version,
-                "capabilities": self.capabilities,
-                "endpoints": {
-                    "/health": "Health check (GET)",
-                    "/invoke": "Agent invocation (POST)",
-                },
-            }
+        app.add_api_route(
+            "/health", self._health_check, methods=["GET"], response_model=HealthResponse
+        )
+        app.add_api_route("/invoke", self._invoke_handler, methods=["POST"])
+        app.add_api_route("/", self._root, methods=["GET"])
 
         self._app = app
         return app
@@ -218,6 +278,7 @@ class Agent(ABC):
         host: str = "0.0.0.0",
         port: int = 8000,
         log_level: str = "info",
+        access_log: bool = False,
         **kwargs: Any,
     ) -> None:
         """
@@ -227,12 +288,20 @@ class Agent(ABC):
             host: Host to bind to
             port: Port to listen on
             log_level: Logging level
+            access_log: Whether to log every request
             **kwargs: Additional uvicorn arguments
         """
         import uvicorn
 
         app = self.create_app()
-        uvicorn.run(app, host=host, port=port, log_level=log_level, **kwargs)
+        uvicorn.run(
+            app,
+            host=host,
+            port=port,
+            log_level=log_level,
+            access_log=access_log,
+            **kwargs,
+        )
 
 
 class FunctionAgent(Agent):
@@ -243,7 +312,7 @@ class FunctionAgent(Agent):
 
     Example:
         ```python
-        async def my_handler(ctx: InvokeContext) -> AsyncIterator[str]:
+        async def my_handler(ctx: InvokeContext) -> AsyncIterator[bytes]:
             sse = SSEResponse(run_id=ctx.run_id)
             yield sse.delta("Hello!")
             yield sse.done(final_message="Hello!")
@@ -261,16 +330,19 @@ class FunctionAgent(Agent):
         self,
         agent_id: str,
         name: str,
-        handler: Callable[[InvokeContext], AsyncIterator[str]],
+        handler: Callable[[InvokeContext], AsyncIterator[bytes]],
         version: str = "0.1.0",
         capabilities: Optional[list[str]] = None,
+        str_frames: bool = False,
     ):
         super().__init__(agent_id, name, version, capabilities)
         self._handler = handler
+        self.str_frames = str_frames
 
-    async def invoke(self, ctx: InvokeContext) -> AsyncIterator[str]:
-        async for event in self._handler(ctx):
-            yield event
+    def invoke(self, ctx: InvokeContext) -> AsyncIterator[bytes]:
+        # Hand back the handler's generator directly rather than relaying
+        # each event through another async generator frame.
+        return self._handler(ctx)
 
 
 def create_agent(
@@ -278,14 +350,15 @@ def create_agent(
     name: str,
     version: str = "0.1.0",
     capabilities: Optional[list[str]] = None,
-) -> Callable[[Callable[[InvokeContext], AsyncIterator[str]]], FunctionAgent]:
+    str_frames: bool = False,
+) -> Callable[[Callable[[InvokeContext], AsyncIterator[bytes]]], FunctionAgent]:
     """
     Decorator to create an agent from a handler function.
 
     Example:
         ```python
         @create_agent("echo", "Echo Agent")
-        async def echo_agent(ctx: InvokeContext) -> AsyncIterator[str]:
+        async def echo_agent(ctx: InvokeContext) -> AsyncIterator[bytes]:
             sse = SSEResponse(run_id=ctx.run_id)
             yield sse.delta(ctx.input_message.content)
             yield sse.done()
@@ -299,13 +372,14 @@ def create_agent(
         name: Human-readable name
         version: Agent version string
         capabilities: List of capability strings
+        str_frames: Whether the handler yields str events instead of bytes
 
     Returns:
         Decorator that creates a FunctionAgent
     """
 
     def decorator(
-        handler: Callable[[InvokeContext], AsyncIterator[str]],
+        handler: Callable[[InvokeContext], AsyncIterator[bytes]],
     ) -> FunctionAgent:
         return FunctionAgent(
             agent_id=agent_id,
@@ -313,6 +387,7 @@ def create_agent(
             handler=handler,
             version=version,
             capabilities=capabilities,
+            str_frames=str_frames,
         )
 
     return decorator
@@ -8,17 +8,29 @@ This module provides clients for:
 - Session management
 """
 
-import json
+import asyncio
 import logging
-from collections.abc import AsyncIterator
+import weakref
+from collections.abc import AsyncIterator, Iterator
 from typing import Any, Optional
 
 import httpx
+from pydantic import TypeAdapter
 
+from ._json import loads
+from ._partial_json import PartialJSONParser
 from .models import Message
 
 logger = logging.getLogger(__name__)
 
+# Validates a whole transcript with one compiled validator
+_MESSAGE_LIST = TypeAdapter(list[Message])
+
+
+def _parse_json(response: httpx.Response) -> Any:
+    """Decode a JSON response body straight from its bytes (orjson when available)."""
+    return loads(response.content)
+
 
 class PlatformError(Exception):
     """Base exception for platform errors."""
@@ -29,9 +41,67 @@ class PlatformError(Exception):
         super().__init__(f"{code}: {message}")
 
 
+def _check_ok(response: httpx.Response) -> None:
+    """Raise PlatformError (code = HTTP status) for a non-2xx response."""
+    code = response.status_code
+    if not 200 <= code < 300:
+        raise PlatformError(str(code), response.text)
+
+
+async def _check_stream_ok(response: httpx.Response) -> None:
+    """Like `_check_ok`, reading the error body of a streamed response first."""
+    if not 200 <= response.status_code < 300:
+        await response.aread()
+        _check_ok(response)
+
+
+def _transport_error(exc: httpx.TransportError) -> PlatformError:
+    """Map an httpx transport failure (connect, read, timeout, ...) to PlatformError."""
+    code = "timeout" if isinstance(exc, httpx.TimeoutException) else "transport_error"
+    return PlatformError(code, str(exc) or type(exc).__name__)
+
+
+class _ErrorMappingStream(httpx.AsyncByteStream):
+    """Response body stream that raises PlatformError for transport failures mid-body."""
+
+    def __init__(self, stream: httpx.AsyncByteStream):
+        self._stream = stream
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        try:
+            async for chunk in self._stream:
+                yield chunk
+        except httpx.TransportError as e:
+            raise _transport_error(e) from e
+
+    async def aclose(self) -> None:
+        await self._stream.aclose()
+
+
+class _PlatformHTTPClient(httpx.AsyncClient):
+    """
+    httpx client whose transport failures surface as PlatformError.
+
+    Together with `_check_ok`, this means callers of the platform clients only
+    have one exception type to handle. Every request goes through `send`
+    (including `stream`), so errors are mapped once here rather than per call.
+    """
+
+    async def send(self, request: httpx.Request, **kwargs: Any) -> httpx.Response:
+        try:
+            response = await super().send(request, **kwargs)
+        except httpx.TransportError as e:
+            raise _transport_error(e) from e
+        if not response.is_stream_consumed:
+            response.stream = _ErrorMappingStream(response.stream)
+        return response
+
+
 class ToolResult:
     """Result of a tool invocation."""
 
+    __slots__ = ("tool_call_id", "status", "result", "error")
+
     def __init__(
         self,
         tool_call_id: str,
@@ -44,6 +114,11 @@ class ToolResult:
         self.result = result
         self.error = error
 
+    @classmethod
+    def _from_json(cls, data: dict[str, Any]) -> "ToolResult":
+        """Build a ToolResult from a tool call response body."""
+        return cls(data["tool_call_id"], data["status"], data.get("result"), data.get("error"))
+
     @property
     def succeeded(self) -> bool:
         return self.status == "succeeded"
@@ -57,6 +132,132 @@ class ToolResult:
         return self.status == "failed"
 
 
+class _SSEByteParser:
+    """
+    Incremental SSE parser over raw response bytes.
+
+    Feed it chunks from `aiter_bytes()`; it yields `(event_type, data)` for
+    each complete event, leaving data as bytes so it can go straight to the
+    JSON decoder without an intermediate str per line. Call `close()` once the
+    body ends to flush an event that was not followed by a blank line.
+    """
+
+    __slots__ = ("_buf", "_event", "_data")
+
+    def __init__(self) -> None:
+        self._buf = bytearray()
+        self._event: Optional[str] = None
+        self._data: list[bytes] = []
+
+    def feed(self, chunk: bytes) -> Iterator[tuple[Optional[str], bytes]]:
+        """
+        Consume a chunk and yield any events it completes.
+
+        Args:
+            chunk: Raw bytes read from the response body
+
+        Yields:
+            (event_type, data) tuples; event_type is None if no event field was sent
+        """
+        buf = self._buf
+        buf += chunk
+        start = 0
+        while (end := buf.find(b"\n", start)) >= 0:
+            # Work on offsets into the buffer so no per-line objects are built
+            line_end = end - 1 if end > start and buf[end - 1] == 0x0D else end
+            line_start = start
+            start = end + 1
+
+            # A blank line terminates the event
+            if line_end == line_start:
+                data = self._data
+                if data:
+                    yield self._event, data[0] if len(data) == 1 else b"\n".join(data)
+                    data.clear()
+                self._event = None
+                continue
+
+            if buf.startswith(b"data:", line_start, line_end):
+                value_start = line_start + 5
+            elif buf.startswith(b"event:", line_start, line_end):
+                value_start = line_start + 6
+            else:
+                # Comments (":...") and other fields are ignored
+                continue
+            if value_start < line_end and buf[value_start] == 0x20:
+                value_start += 1
+
+            if buf[line_start] == 0x64:  # "d" -> data
+                self._data.append(bytes(buf[value_start:line_end]))
+            else:
+                self._event = buf[value_start:line_end].decode()
+        del buf[:start]
+
+    def close(self) -> Iterator[tuple[Optional[str], bytes]]:
+        """
+        Flush at end of stream.
+
+        Yields the last event if the stream ended without the blank line that
+        normally terminates it (a final unterminated line still counts).
+        """
+        yield from self.feed(b"\n\n" if self._buf else b"\n")
+
+
+async def _iter_sse(response: httpx.Response) -> AsyncIterator[tuple[Optional[str], bytes]]:
+    """Parse a streamed response body into `(event_type, data)` pairs."""
+    parser = _SSEByteParser()
+    async for chunk in response.aiter_bytes():
+        for event in parser.feed(chunk):
+            yield event
+    for event in parser.close():
+        yield event
+
+
+class _ToolCallArgs:
+    """Arguments of one streamed tool call, parsed as they arrive."""
+
+    __slots__ = ("id", "name", "parser")
+
+    def __init__(self, tool_call_id: Optional[str]) -> None:
+        self.id = tool_call_id
+        self.name: Optional[str] = None
+        self.parser: Optional[PartialJSONParser] = PartialJSONParser()
+
+
+def _tool_call_deltas(
+    chunk: dict[str, Any], calls: dict[tuple[int, int], _ToolCallArgs]
+) -> Iterator[dict[str, Any]]:
+    """Feed a chunk's tool-call argument fragments to their parsers and yield updates."""
+    for choice in chunk.get("choices") or ():
+        tool_calls = (choice.get("delta") or {}).get("tool_calls")
+        if not tool_calls:
+            continue
+        for tool_call in tool_calls:
+            # OpenAI sends the id only on a call's first fragment; index identifies the rest
+            key = (choice.get("index", 0), tool_call.get("index", 0))
+            call = calls.get(key)
+            if call is None:
+                call = calls[key] = _ToolCallArgs(tool_call.get("id"))
+            function = tool_call.get("function") or {}
+            if function.get("name"):
+                call.name = function["name"]
+            arguments = function.get("arguments")
+            if not arguments or call.parser is None:
+                continue
+            try:
+                call.parser.feed(arguments)
+            except ValueError as e:
+                logger.warning("Stopped parsing arguments of tool call %s: %s", call.id, e)
+                call.parser = None
+                continue
+            yield {
+                "type": "tool_call_delta",
+                "id": call.id,
+                "name": call.name,
+                "partial_args": call.parser.value,
+            }
+
+
 class LLMClient:
     """
     OpenAI-compatible LLM client that routes through the platform.
@@ -87,6 +288,7 @@ class LLMClient:
     def __init__(self, http_client: httpx.AsyncClient, run_id: str):
         self._client = http_client
         self._run_id = run_id
+        self._headers = {"x-run-id": run_id}
 
     async def chat_completions(
         self,
@@ -105,25 +307,23 @@ class LLMClient:
         Returns:
             OpenAI-compatible response
         """
-        payload = {
-            "model": model,
-            "messages": messages,
-            "stream": False,
-            **kwargs,
-        }
+        payload = {"model": model, "messages": messages, "stream": False}
+        if kwargs:
+            payload.update(kwargs)
 
         response = await self._client.post(
             "/v1/chat/completions",
             json=payload,
-            headers={"x-run-id": self._run_id},
+            headers=self._headers,
         )
-        response.raise_for_status()
-        return response.json()
+        _check_ok(response)
+        return _parse_json(response)
 
     async def chat_completions_stream(
         self,
         model: str,
         messages: list[dict[str, str]],
+        parse_tool_args: bool = False,
         **kwargs: Any,
     ) -> AsyncIterator[dict[str, Any]]:
         """
@@ -132,31 +332,38 @@ class LLMClient:
         Args:
             model: Model name
             messages: List of messages
+            parse_tool_args: Also yield a `tool_call_delta` event after each
+                tool-call argument fragment, with the arguments parsed so far
             **kwargs: Additional OpenAI parameters
 
         Yields:
-            OpenAI-compatible streaming chunks
+            OpenAI-compatible streaming chunks. With parse_tool_args, these are
+            interleaved with `{"type": "tool_call_delta", "id", "name",
+            "partial_args"}` events; `partial_args` is updated in place as
+            more fragments arrive.
         """
-        payload = {
-            "model": model,
-            "messages": messages,
-            "stream": True,
-            **kwargs,
-        }
+        payload = {"model": model, "messages": messages, "stream": True}
+        if kwargs:
+            payload.update(kwargs)
 
         async with self._client.stream(
             "POST",
             "/v1/chat/completions",
             json=payload,
-            headers={"x-run-id": self._run_id},
+            headers=self._headers,
         ) as response:
-            response.raise_for_status()
-            async for line in response.aiter_lines():
-                if line.startswith("data: "):
-                    data = line[6:]
-                    if data == "[DONE]":
-                        break
-                    yield json.loads(data)
+            await _check_stream_ok(response)
+            tool_calls: Optional[dict[tuple[int, int], _ToolCallArgs]] = (
+                {} if parse_tool_args else None
+            )
+            async for _, data in _iter_sse(response):
+                if data == b"[DONE]":
+                    return
+                completion_chunk = loads(data)
+                yield completion_chunk
+                if tool_calls is not None:
+                    for event in _tool_call_deltas(completion_chunk, tool_calls):
+                        yield event
 
 
 class ToolClient:
@@ -194,6 +401,7 @@ class ToolClient:
         args: dict[str, Any],
         idempotency_key: Optional[str] = None,
         timeout_ms: int = 60000,
+        wait_ms: Optional[int] = None,
     ) -> ToolResult:
         """
         Invoke a tool.
@@ -203,6 +411,9 @@ class ToolClient:
             args: Tool arguments
             idempotency_key: Optional idempotency key
             timeout_ms: Timeout in milliseconds
+            wait_ms: Ask the server (via `Prefer: wait=<ms>`) to hold the
+                response until the call completes or this many milliseconds
+                pass. Servers without support ignore it and answer immediately.
 
         Returns:
             ToolResult with status and result/error
@@ -218,16 +429,10 @@ class ToolClient:
         response = await self._client.post(
             f"/v1/tools/{tool_name}:invoke",
             json=payload,
+            headers={"Prefer": f"wait={wait_ms}"} if wait_ms else None,
         )
-        response.raise_for_status()
-        data = response.json()
-
-        return ToolResult(
-            tool_call_id=data["tool_call_id"],
-            status=data["status"],
-            result=data.get("result"),
-            error=data.get("error"),
-        )
+        _check_ok(response)
+        return ToolResult._from_json(_parse_json(response))
 
     async def get_status(self, tool_call_id: str) -> ToolResult:
         """
@@ -240,15 +445,8 @@ class ToolClient:
             ToolResult with current status
         """
         response = await self._client.get(f"/v1/tool_calls/{tool_call_id}")
-        response.raise_for_status()
-        data = response.json()
-
-        return ToolResult(
-            tool_call_id=data["tool_call_id"],
-            status=data["status"],
-            result=data.get("result"),
-            error=data.get("error"),
-        )
+        _check_ok(response)
+        return ToolResult._from_json(_parse_json(response))
 
     async def wait(
         self,
@@ -269,15 +467,8 @@ class ToolClient:
             f"/v1/tool_calls/{tool_call_id}:wait",
             params={"timeout_ms": timeout_ms},
         )
-        response.raise_for_status()
-        data = response.json()
-
-        return ToolResult(
-            tool_call_id=data["tool_call_id"],
-            status=data["status"],
-            result=data.get("result"),
-            error=data.get("error"),
-        )
+        _check_ok(response)
+        return ToolResult._from_json(_parse_json(response))
 
     async def invoke_and_wait(
         self,
@@ -285,22 +476,33 @@ class ToolClient:
         args: dict[str, Any],
         idempotency_key: Optional[str] = None,
         timeout_ms: int = 60000,
+        wait_inline: bool = False,
     ) -> ToolResult:
         """
         Invoke a tool and wait for completion.
 
-        This is a convenience method that combines invoke + wait.
+        This is a convenience method that combines invoke + wait. With
+        `wait_inline`, the invoke request itself asks the server to long-poll,
+        so a call that completes in time needs a single round trip; the
+        follow-up wait is only sent if the result is still pending.
 
         Args:
             tool_name: Name of the tool to invoke
             args: Tool arguments
             idempotency_key: Optional idempotency key
             timeout_ms: Timeout in milliseconds
+            wait_inline: Send `Prefer: wait=<timeout_ms>` on the invoke request
 
         Returns:
             ToolResult with final status
         """
-        result = await self.invoke(tool_name, args, idempotency_key, timeout_ms)
+        result = await self.invoke(
+            tool_name,
+            args,
+            idempotency_key,
+            timeout_ms,
+            wait_ms=timeout_ms if wait_inline else None,
+        )
         if result.pending:
             result = await self.wait(result.tool_call_id, timeout_ms)
         return result
@@ -353,18 +555,10 @@ class AgentClient:
             f"/v1/agents/{agent_id}:invoke",
             json=payload,
         ) as response:
-            response.raise_for_status()
-
-            event_type = None
-            async for line in response.aiter_lines():
-                line = line.strip()
-                if not line:
-                    continue
-                if line.startswith("event:"):
-                    event_type = line[6:].strip()
-                elif line.startswith("data:"):
-                    data = json.loads(line[5:].strip())
-                    yield {"type": event_type, "data": data}
+            await _check_stream_ok(response)
+
+            async for event_type, data in _iter_sse(response):
+                yield {"type": event_type, "data": loads(data)}
 
     async def list_agents(self) -> list[dict[str, Any]]:
         """
@@ -374,8 +568,8 @@ class AgentClient:
             List of agent information
         """
         response = await self._client.get("/v1/agents")
-        response.raise_for_status()
-        return response.json()["agents"]
+        _check_ok(response)
+        return _parse_json(response)["agents"]
 
 
 class SessionClient:
@@ -421,10 +615,57 @@ class SessionClient:
             f"/v1/sessions/{session_id}/messages",
             params=params,
         )
-        response.raise_for_status()
-        data = response.json()
+        _check_ok(response)
+        data = _parse_json(response)
+
+        return _MESSAGE_LIST.validate_python(data["messages"])
+
+
+# Shared httpx clients for PlatformClient.from_shared, keyed by (base_url, timeout),
+# with the event loop each was created on (pooled connections are tied to it)
+_shared_clients: dict[tuple[str, float], tuple[asyncio.AbstractEventLoop, httpx.AsyncClient]] = {}
+
+
+def _new_http_client(
+    base_url: str,
+    timeout: float,
+    max_connections: int = 100,
+    max_keepalive_connections: int = 50,
+    keepalive_expiry: float = 30.0,
+    http2: bool = True,
+) -> httpx.AsyncClient:
+    """Build the pooled httpx client used by PlatformClient."""
+    return _PlatformHTTPClient(
+        base_url=base_url,
+        timeout=timeout,
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        ),
+        http2=http2,
+    )
+
 
-        return [Message(**msg) for msg in data["messages"]]
+# aclose tasks started by finalizers, held so they are not collected mid-run
+_closing_tasks: set[asyncio.Task] = set()
+
+
+def _start_aclose(http_client: httpx.AsyncClient) -> None:
+    task = asyncio.get_running_loop().create_task(http_client.aclose())
+    _closing_tasks.add(task)
+    task.add_done_callback(_closing_tasks.discard)
+
+
+def _schedule_aclose(http_client: httpx.AsyncClient, loop: asyncio.AbstractEventLoop) -> None:
+    """Finalizer for an unclosed PlatformClient: close its pool on the loop it was made on."""
+    if http_client.is_closed or loop.is_closed() or not loop.is_running():
+        return
+    try:
+        loop.call_soon_threadsafe(_start_aclose, http_client)
+    except RuntimeError:
+        # The loop closed between the check and the call
+        pass
 
 
 class PlatformClient:
@@ -437,10 +678,16 @@ class PlatformClient:
     - Agent-to-agent calls
     - Session management
 
+    HTTP/2 is negotiated by default (via ALPN on https URLs; plain http
+    stays on HTTP/1.1), letting concurrent LLM, tool and agent streams
+    share one multiplexed connection. This needs the `h2` package, which
+    the SDK pulls in through the `httpx[http2]` dependency.
+
     Example:
         ```python
         async def my_agent(ctx: InvokeContext):
-            client = PlatformClient(
+            # Per-request clients should share one pool; see from_shared
+            client = PlatformClient.from_shared(
                 base_url=ctx.platform_base_url or "http://orchestrator:8080",
                 run_id=ctx.run_id,
             )
@@ -464,6 +711,10 @@ class PlatformClient:
         base_url: str,
         run_id: str,
         timeout: float = 300.0,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 50,
+        keepalive_expiry: float = 30.0,
+        http2: bool = True,
     ):
         """
         Initialize the platform client.
@@ -472,13 +723,40 @@ class PlatformClient:
             base_url: Platform orchestrator URL
             run_id: Current run ID (for tracing)
             timeout: HTTP timeout in seconds
+            max_connections: Maximum concurrent connections to the platform
+            max_keepalive_connections: Idle connections kept open for reuse
+            keepalive_expiry: Seconds an idle connection is kept before closing
+            http2: Negotiate HTTP/2 so concurrent streams share one connection
         """
-        self._base_url = base_url.rstrip("/")
-        self._run_id = run_id
-        self._client = httpx.AsyncClient(
-            base_url=self._base_url,
-            timeout=timeout,
+        base_url = base_url.rstrip("/")
+        http_client = _new_http_client(
+            base_url, timeout, max_connections, max_keepalive_connections, keepalive_expiry, http2
         )
+        self._bind(base_url, run_id, http_client, owns_client=True)
+
+    def _bind(
+        self,
+        base_url: str,
+        run_id: str,
+        http_client: httpx.AsyncClient,
+        owns_client: bool,
+    ) -> None:
+        self._base_url = base_url
+        self._run_id = run_id
+        self._client = http_client
+        self._owns_client = owns_client
+        self._closed = False
+
+        # Close an owned pool even if the caller never awaits close()
+        self._finalizer: Optional[weakref.finalize] = None
+        if owns_client:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                loop = None
+            if loop is not None:
+                self._finalizer = weakref.finalize(self, _schedule_aclose, http_client, loop)
+                self._finalizer.atexit = False
 
         # Initialize sub-clients
         self.llm = LLMClient(self._client, run_id)
@@ -486,9 +764,79 @@ class PlatformClient:
         self.agents = AgentClient(self._client, run_id)
         self.sessions = SessionClient(self._client)
 
+    @classmethod
+    def from_shared(
+        cls,
+        base_url: str,
+        run_id: str,
+        timeout: float = 300.0,
+    ) -> "PlatformClient":
+        """
+        Create a client backed by a process-wide shared connection pool.
+
+        Clients for the same base URL and timeout reuse one httpx.AsyncClient,
+        so warm connections survive across /invoke requests. `close` on such
+        a client leaves the shared pool open; call `shutdown_shared` when the
+        agent shuts down (e.g. from `Agent.on_shutdown`).
+
+        Must be called from a running event loop. Pooled connections belong to
+        the loop they were opened on, so when called from a different loop
+        than the pool was created on, a new pool replaces it and the old one
+        is closed on its own loop if that loop is still running.
+
+        Args:
+            base_url: Platform orchestrator URL
+            run_id: Current run ID (for tracing)
+            timeout: HTTP timeout in seconds
+
+        Returns:
+            PlatformClient using the shared pool
+        """
+        base_url = base_url.rstrip("/")
+        key = (base_url, timeout)
+        loop = asyncio.get_running_loop()
+        shared = _shared_clients.get(key)
+        if shared is not None and shared[0] is loop and not shared[1].is_closed:
+            http_client = shared[1]
+        else:
+            if shared is not None:
+                _schedule_aclose(shared[1], shared[0])
+            http_client = _new_http_client(base_url, timeout)
+            _shared_clients[key] = (loop, http_client)
+
+        client = cls.__new__(cls)
+        client._bind(base_url, run_id, http_client, owns_client=False)
+        return client
+
+    @staticmethod
+    async def shutdown_shared() -> None:
+        """
+        Close every shared connection pool created by `from_shared`.
+
+        Pools created on another, still running loop are closed on that loop.
+        """
+        loop = asyncio.get_running_loop()
+        shared = list(_shared_clients.values())
+        _shared_clients.clear()
+        for client_loop, http_client in shared:
+            if client_loop is loop:
+                await http_client.aclose()
+            else:
+                _schedule_aclose(http_client, client_loop)
+
     async def close(self) -> None:
-        """Close the HTTP client."""
-        await self._client.aclose()
+        """
+        Close the HTTP client (a no-op for clients from `from_shared`).
+
+        Safe to call more than once.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        if self._finalizer is not None:
+            self._finalizer.detach()
+        if self._owns_client:
+            await self._client.aclose()
 
     async def __aenter__(self) -> "PlatformClient":
         return self
@@ -523,5 +871,5 @@ class PlatformClient:
         }
 
         response = await self._client.post("/v1/agents/register", json=payload)
-        response.raise_for_status()
-        return response.json()
+        _check_ok(response)
+        return _parse_json(response)
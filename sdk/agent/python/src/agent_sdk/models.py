@@ -1,10 +1,11 @@
 """
-Pydantic models for agent SDK.
+Data models for agent SDK.
 
 These models define the data structures for communication between
 the platform and agents.
 """
 
+from dataclasses import dataclass, field
 from enum import Enum
 from typing import Any, Optional
 
@@ -64,19 +65,23 @@ class InvokeRequest(BaseModel):
     )
 
 
-class InvokeContext(BaseModel):
+@dataclass(slots=True)
+class InvokeContext:
     """
     Context available to the agent during invocation.
 
     This is a convenience wrapper that combines request data with headers.
+    It is a plain slotted dataclass rather than a Pydantic model: every
+    field comes from an already-validated InvokeRequest, so building one
+    per /invoke call is just a few attribute copies.
     """
 
     agent_id: str
     session_id: str
     run_id: str
     input_message: Message
-    messages: list[Message] = Field(default_factory=list)
-    context: dict[str, Any] = Field(default_factory=dict)
+    messages: list[Message] = field(default_factory=list)
+    context: dict[str, Any] = field(default_factory=dict)
 
     # Headers from the request
     traceparent: Optional[str] = None
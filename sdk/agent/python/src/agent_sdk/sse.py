@@ -5,29 +5,127 @@ This module provides helpers to create SSE streams that conform to
 the platform's agent protocol.
 """
 
-import json
 from collections.abc import AsyncIterator, Iterator
 from typing import Any, Optional, Union
 
-from .models import DeltaEvent, DoneEvent, ErrorEvent, SSEEventType, StateEvent, Usage
+from ._json import dumps
+from .models import SSEEventType, Usage
 
+# Event payloads are built as plain dicts matching the DeltaEvent/StateEvent/
+# DoneEvent/ErrorEvent schemas (None fields omitted) rather than by
+# constructing and dumping those Pydantic models for every event.
 
-def format_sse_event(event_type: str, data: Union[dict, str]) -> str:
+# Event type strings, resolved once instead of per event
+_DELTA = SSEEventType.DELTA.value
+_STATE = SSEEventType.STATE.value
+_DONE = SSEEventType.DONE.value
+_ERROR = SSEEventType.ERROR.value
+
+# SSE framing, pre-encoded once
+_EVENT_PREFIX = b"event: "
+_DATA_PREFIX = b"\ndata: "
+_EVENT_SUFFIX = b"\n\n"
+
+# Full "event: <type>\ndata: " prefix for each standard event type
+_EVENT_PREFIXES = {t.value: _EVENT_PREFIX + t.value.encode() + _DATA_PREFIX for t in SSEEventType}
+
+
+def format_sse_event(event_type: str, data: Union[dict, str]) -> bytes:
     """
     Format a single SSE event.
 
+    The event is returned UTF-8 encoded so StreamingResponse can send it
+    as-is instead of encoding every chunk itself.
+
     Args:
         event_type: The event type (delta, done, error, state)
         data: The event data (will be JSON encoded if dict)
 
     Returns:
-        Formatted SSE event string
+        Formatted SSE event bytes
     """
     if isinstance(data, dict):
-        data_str = json.dumps(data, ensure_ascii=False)
+        payload = dumps(data)
+    else:
+        payload = data.encode()
+    prefix = _EVENT_PREFIXES.get(event_type)
+    if prefix is None:
+        prefix = _EVENT_PREFIX + event_type.encode() + _DATA_PREFIX
+    return prefix + payload + _EVENT_SUFFIX
+
+
+def sse_delta(text: str, run_id: Optional[str] = None) -> bytes:
+    """
+    Create a delta (streaming text) event.
+
+    Stateless counterpart of `SSEResponse.delta` for callers that only
+    need the run ID and want to skip building a builder per request.
+
+    Args:
+        text: The text chunk to stream
+        run_id: The run ID to include in the event
+
+    Returns:
+        Formatted SSE event bytes
+    """
+    if run_id is None:
+        data = {"text": text}
     else:
-        data_str = data
-    return f"event: {event_type}\ndata: {data_str}\n\n"
+        data = {"text": text, "run_id": run_id}
+    return format_sse_event(_DELTA, data)
+
+
+def sse_state(state: str, detail: Optional[dict[str, Any]] = None) -> bytes:
+    """
+    Create a state change event.
+
+    Args:
+        state: The new state name
+        detail: Optional details about the state
+
+    Returns:
+        Formatted SSE event bytes
+    """
+    data: dict[str, Any] = {"state": state}
+    if detail is not None:
+        data["detail"] = detail
+    return format_sse_event(_STATE, data)
+
+
+def sse_done(
+    final_message: Optional[str] = None,
+    usage: Optional[Usage] = None,
+) -> bytes:
+    """
+    Create a done event.
+
+    Args:
+        final_message: The complete final message
+        usage: Optional usage statistics
+
+    Returns:
+        Formatted SSE event bytes
+    """
+    data: dict[str, Any] = {}
+    if final_message is not None:
+        data["final_message"] = final_message
+    if usage is not None:
+        data["usage"] = usage.model_dump(exclude_none=True)
+    return format_sse_event(_DONE, data)
+
+
+def sse_error(code: str, message: str) -> bytes:
+    """
+    Create an error event.
+
+    Args:
+        code: Error code
+        message: Error message
+
+    Returns:
+        Formatted SSE event bytes
+    """
+    return format_sse_event(_ERROR, {"code": code, "message": message})
 
 
 class SSEResponse:
@@ -54,6 +152,8 @@ class SSEResponse:
         ```
     """
 
+    __slots__ = ("run_id", "_pending", "_pending_size")
+
     def __init__(self, run_id: Optional[str] = None):
         """
         Initialize SSE response builder.
@@ -62,8 +162,10 @@ class SSEResponse:
             run_id: The run ID to include in events
         """
         self.run_id = run_id
+        self._pending: list[str] = []
+        self._pending_size = 0
 
-    def delta(self, text: str) -> str:
+    def delta(self, text: str) -> bytes:
         """
         Create a delta (streaming text) event.
 
@@ -71,12 +173,47 @@ class SSEResponse:
             text: The text chunk to stream
 
         Returns:
-            Formatted SSE event string
+            Formatted SSE event bytes
+        """
+        return sse_delta(text, self.run_id)
+
+    def buffered_delta(self, text: str, min_chars: int = 256) -> Optional[bytes]:
+        """
+        Buffer text and emit a single delta event once enough has accumulated.
+
+        Coalescing many tiny chunks into one event saves a frame and an
+        ASGI send per chunk. Call `flush` before `done` to emit any
+        remaining buffered text.
+
+        Args:
+            text: The text chunk to stream
+            min_chars: Buffered size (in characters) that triggers an event
+
+        Returns:
+            Formatted SSE event bytes, or None while still buffering
+        """
+        self._pending.append(text)
+        self._pending_size += len(text)
+        if self._pending_size < min_chars:
+            return None
+        return self.flush()
+
+    def flush(self) -> Optional[bytes]:
         """
-        event = DeltaEvent(text=text, run_id=self.run_id)
-        return format_sse_event(SSEEventType.DELTA.value, event.model_dump(exclude_none=True))
+        Emit buffered text from `buffered_delta` as a delta event.
 
-    def state(self, state: str, detail: Optional[dict[str, Any]] = None) -> str:
+        Returns:
+            Formatted SSE event bytes, or None if nothing is buffered
+        """
+        if not self._pending_size:
+            self._pending.clear()
+            return None
+        text = "".join(self._pending)
+        self._pending.clear()
+        self._pending_size = 0
+        return self.delta(text)
+
+    def state(self, state: str, detail: Optional[dict[str, Any]] = None) -> bytes:
         """
         Create a state change event.
 
@@ -85,16 +222,15 @@ class SSEResponse:
             detail: Optional details about the state
 
         Returns:
-            Formatted SSE event string
+            Formatted SSE event bytes
         """
-        event = StateEvent(state=state, detail=detail)
-        return format_sse_event(SSEEventType.STATE.value, event.model_dump(exclude_none=True))
+        return sse_state(state, detail)
 
     def done(
         self,
         final_message: Optional[str] = None,
         usage: Optional[Usage] = None,
-    ) -> str:
+    ) -> bytes:
         """
         Create a done event.
 
@@ -103,12 +239,11 @@ class SSEResponse:
             usage: Optional usage statistics
 
         Returns:
-            Formatted SSE event string
+            Formatted SSE event bytes
         """
-        event = DoneEvent(final_message=final_message, usage=usage)
-        return format_sse_event(SSEEventType.DONE.value, event.model_dump(exclude_none=True))
+        return sse_done(final_message, usage)
 
-    def error(self, code: str, message: str) -> str:
+    def error(self, code: str, message: str) -> bytes:
         """
         Create an error event.
 
@@ -117,10 +252,9 @@ class SSEResponse:
             message: Error message
 
         Returns:
-            Formatted SSE event string
+            Formatted SSE event bytes
         """
-        event = ErrorEvent(code=code, message=message)
-        return format_sse_event(SSEEventType.ERROR.value, event.model_dump())
+        return sse_error(code, message)
 
 
 async def stream_text(
@@ -128,33 +262,63 @@ async def stream_text(
     run_id: Optional[str] = None,
     chunk_size: int = 10,
     delay_ms: int = 50,
-) -> AsyncIterator[str]:
+    max_chunk_batch_ms: float = 0.0,
+    max_batch_chars: int = 256,
+) -> AsyncIterator[bytes]:
     """
     Stream text as SSE delta events with simulated typing delay.
 
     This is a convenience function for streaming text character by character
     or in chunks, useful for demos and testing.
 
+    With `max_chunk_batch_ms` set, chunks produced within that window are
+    coalesced into one delta event, keeping the same typing pace while
+    sending fewer frames. A batch is also sent once it reaches
+    `max_batch_chars`, so a fast (or zero) delay or a long window never
+    collapses the stream into one large frame.
+
     Args:
         text: The text to stream
         run_id: The run ID to include in events
         chunk_size: Number of characters per chunk
         delay_ms: Delay between chunks in milliseconds
+        max_chunk_batch_ms: Window for coalescing chunks into one event (0 disables)
+        max_batch_chars: Size (in characters) at which a batch is sent early
 
     Yields:
-        Formatted SSE event strings
+        Formatted SSE event bytes
     """
     import asyncio
 
     sse = SSEResponse(run_id=run_id)
     delay_sec = delay_ms / 1000.0
-
-    for i in range(0, len(text), chunk_size):
-        chunk = text[i : i + chunk_size]
-        yield sse.delta(chunk)
+    batch_sec = max_chunk_batch_ms / 1000.0
+    loop = asyncio.get_running_loop()
+    pending: list[str] = []
+    pending_size = 0
+    batch_started = 0.0
+
+    chunks = [text[i : i + chunk_size] for i in range(0, len(text), chunk_size)]
+
+    for chunk in chunks:
+        if batch_sec > 0:
+            now = loop.time()
+            if not pending:
+                batch_started = now
+            pending.append(chunk)
+            pending_size += len(chunk)
+            if pending_size >= max_batch_chars or now - batch_started >= batch_sec:
+                yield sse.delta("".join(pending))
+                pending.clear()
+                pending_size = 0
+        else:
+            yield sse.delta(chunk)
         if delay_ms > 0:
             await asyncio.sleep(delay_sec)
 
+    if pending:
+        yield sse.delta("".join(pending))
+
     yield sse.done(final_message=text)
 
 
@@ -162,7 +326,7 @@ def stream_text_sync(
     text: str,
     run_id: Optional[str] = None,
     chunk_size: int = 10,
-) -> Iterator[str]:
+) -> Iterator[bytes]:
     """
     Stream text as SSE delta events (synchronous version).
 
@@ -172,12 +336,11 @@ def stream_text_sync(
         chunk_size: Number of characters per chunk
 
     Yields:
-        Formatted SSE event strings
+        Formatted SSE event bytes
     """
     sse = SSEResponse(run_id=run_id)
 
-    for i in range(0, len(text), chunk_size):
-        chunk = text[i : i + chunk_size]
+    for chunk in [text[i : i + chunk_size] for i in range(0, len(text), chunk_size)]:
         yield sse.delta(chunk)
 
     yield sse.done(final_message=text)
@@ -0,0 +1,117 @@
+"""Tests for the agent HTTP app."""
+
+import pytest
+from fastapi.testclient import TestClient
+
+import agent_sdk.agent
+from agent_sdk import SSEResponse, create_agent
+
+INVOKE_BODY = {
+    "agent_id": "echo",
+    "session_id": "s1",
+    "run_id": "r1",
+    "input_message": {"role": "user", "content": "hi"},
+    "messages": [],
+}
+
+EXPECTED_STREAM = (
+    'event: delta\ndata: {"text":"hi","run_id":"r1"}\n\n'
+    'event: done\ndata: {"final_message":"hi"}\n\n'
+)
+
+
+@pytest.fixture(params=["sse-starlette", "streaming-response"])
+def response_class(request, monkeypatch):
+    """Run each test with EventSourceResponse and with the StreamingResponse fallback."""
+    if request.param == "sse-starlette":
+        pytest.importorskip("sse_starlette")
+    else:
+        monkeypatch.setattr(agent_sdk.agent, "EventSourceResponse", None)
+    return request.param
+
+
+def post_invoke(agent, **kwargs):
+    response = TestClient(agent.create_app()).post("/invoke", json=INVOKE_BODY, **kwargs)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    return response
+
+
+def test_invoke_passes_bytes_frames_through(response_class, monkeypatch):
+    def no_relay(events):
+        raise AssertionError("bytes frames should not be re-encoded")
+
+    monkeypatch.setattr(agent_sdk.agent, "_encode_frames", no_relay)
+
+    @create_agent("echo", "Echo Agent")
+    async def echo(ctx):
+        sse = SSEResponse(run_id=ctx.run_id)
+        yield sse.delta("hi")
+        yield sse.done(final_message="hi")
+
+    assert post_invoke(echo).text == EXPECTED_STREAM
+
+
+def test_invoke_sends_str_frames_verbatim(response_class):
+    @create_agent("echo", "Echo Agent", str_frames=True)
+    async def echo(ctx):
+        yield 'event: delta\ndata: {"text":"hi","run_id":"r1"}\n\n'
+        yield SSEResponse(run_id=ctx.run_id).done(final_message="hi")
+
+    assert post_invoke(echo).text == EXPECTED_STREAM
+
+
+def context_agent(seen: list):
+    @create_agent("echo", "Echo Agent")
+    async def echo(ctx):
+        seen.append(ctx)
+        yield SSEResponse(run_id=ctx.run_id).done()
+
+    return echo
+
+
+def test_invoke_uses_body_ids_without_headers():
+    seen = []
+    post_invoke(context_agent(seen))
+    ctx = seen[0]
+    assert (ctx.session_id, ctx.run_id) == ("s1", "r1")
+    assert ctx.traceparent is None
+    assert ctx.platform_base_url is None
+
+
+def test_invoke_header_overrides():
+    seen = []
+    post_invoke(
+        context_agent(seen),
+        headers={
+            "X-Session-ID": "s2",
+            "X-Run-ID": "r2",
+            "traceparent": "00-trace-span-01",
+            "X-Platform-Base-URL": "http://orchestrator:8080",
+        },
+    )
+    ctx = seen[0]
+    assert (ctx.session_id, ctx.run_id) == ("s2", "r2")
+    assert ctx.traceparent == "00-trace-span-01"
+    assert ctx.platform_base_url == "http://orchestrator:8080"
+
+
+def test_invoke_first_repeated_header_wins():
+    seen = []
+    post_invoke(
+        context_agent(seen),
+        headers=[
+            ("X-Session-ID", "s2"),
+            ("X-Session-ID", "s3"),
+            ("X-Run-ID", "r2"),
+            ("X-Run-ID", "r3"),
+            ("traceparent", "00-first-span-01"),
+            ("traceparent", "00-second-span-01"),
+            ("X-Platform-Base-URL", "http://first"),
+            ("X-Platform-Base-URL", "http://second"),
+        ],
+    )
+    ctx = seen[0]
+    assert (ctx.session_id, ctx.run_id) == ("s2", "r2")
+    assert ctx.traceparent == "00-first-span-01"
+    assert ctx.platform_base_url == "http://first"
@@ -0,0 +1,338 @@
+"""Tests for the platform client."""
+
+import asyncio
+import gc
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+
+from agent_sdk.client import (
+    AgentClient,
+    PlatformClient,
+    PlatformError,
+    ToolClient,
+    _PlatformHTTPClient,
+    _SSEByteParser,
+    _tool_call_deltas,
+)
+
+
+def parse(*chunks: bytes, close: bool = True) -> list:
+    parser = _SSEByteParser()
+    events = [event for chunk in chunks for event in parser.feed(chunk)]
+    if close:
+        events.extend(parser.close())
+    return events
+
+
+STREAM = b'event: delta\ndata: {"text":"hi"}\n\nevent: done\ndata: {"final_message":"hi"}\n\n'
+EVENTS = [("delta", b'{"text":"hi"}'), ("done", b'{"final_message":"hi"}')]
+
+
+class TestSSEByteParser:
+    def test_whole_stream(self):
+        assert parse(STREAM) == EVENTS
+
+    def test_split_at_every_byte(self):
+        assert parse(*(STREAM[i : i + 1] for i in range(len(STREAM)))) == EVENTS
+
+    def test_crlf_line_endings(self):
+        assert parse(STREAM.replace(b"\n", b"\r\n")) == EVENTS
+
+    def test_crlf_split_between_cr_and_lf(self):
+        stream = STREAM.replace(b"\n", b"\r\n")
+        cut = stream.index(b"\r") + 1
+        assert parse(stream[:cut], stream[cut:]) == EVENTS
+
+    def test_comments_and_unknown_fields_are_ignored(self):
+        assert parse(b": ping\n\nid: 1\nretry: 10\n" + STREAM) == EVENTS
+
+    def test_multi_line_data_is_joined(self):
+        assert parse(b"data: a\ndata: b\ndata:c\n\n") == [(None, b"a\nb\nc")]
+
+    def test_event_without_type(self):
+        assert parse(b"data: [DONE]\n\n") == [(None, b"[DONE]")]
+
+    def test_blank_lines_without_data_yield_nothing(self):
+        assert parse(b"\n\nevent: delta\n\n") == []
+
+    def test_event_type_does_not_leak_into_next_event(self):
+        assert parse(b"event: delta\ndata: 1\n\ndata: 2\n\n") == [("delta", b"1"), (None, b"2")]
+
+    def test_close_flushes_event_without_trailing_blank_line(self):
+        assert parse(b'event: done\ndata: {"final_message":"hi"}\n') == EVENTS[1:]
+
+    def test_close_flushes_unterminated_last_line(self):
+        assert parse(b'event: done\ndata: {"final_message":"hi"}') == EVENTS[1:]
+
+    def test_nothing_pending_until_close(self):
+        assert parse(b"event: done\ndata: {}\n", close=False) == []
+
+    def test_close_after_complete_stream_yields_nothing_more(self):
+        parser = _SSEByteParser()
+        assert list(parser.feed(STREAM)) == EVENTS
+        assert list(parser.close()) == []
+
+
+def test_agent_invoke_yields_final_event_at_eof():
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=STREAM.rstrip(b"\n"))
+
+    async def collect():
+        async with httpx.AsyncClient(
+            base_url="http://orchestrator", transport=httpx.MockTransport(handler)
+        ) as http_client:
+            client = AgentClient(http_client, "run_1")
+            return [event async for event in client.invoke("echo", {"role": "user"})]
+
+    assert asyncio.run(collect()) == [
+        {"type": "delta", "data": {"text": "hi"}},
+        {"type": "done", "data": {"final_message": "hi"}},
+    ]
+
+
+class _FailingStream(httpx.AsyncByteStream):
+    async def __aiter__(self):
+        yield b'event: delta\ndata: {"text":"hi"}\n\n'
+        raise httpx.ReadError("connection reset")
+
+
+def mock_client(handler) -> _PlatformHTTPClient:
+    return _PlatformHTTPClient(
+        base_url="http://orchestrator", transport=httpx.MockTransport(handler)
+    )
+
+
+class TestPlatformErrors:
+    def test_http_status_error(self):
+        async def call():
+            async with mock_client(lambda request: httpx.Response(404, text="no such call")) as c:
+                await ToolClient(c, "run_1").get_status("call_1")
+
+        with pytest.raises(PlatformError) as info:
+            asyncio.run(call())
+        assert (info.value.code, info.value.message) == ("404", "no such call")
+
+    def test_connect_error(self):
+        def handler(request):
+            raise httpx.ConnectError("connection refused", request=request)
+
+        async def call():
+            async with mock_client(handler) as c:
+                await ToolClient(c, "run_1").get_status("call_1")
+
+        with pytest.raises(PlatformError) as info:
+            asyncio.run(call())
+        assert info.value.code == "transport_error"
+        assert isinstance(info.value.__cause__, httpx.ConnectError)
+
+    def test_timeout(self):
+        def handler(request):
+            raise httpx.ReadTimeout("timed out", request=request)
+
+        async def call():
+            async with mock_client(handler) as c:
+                await ToolClient(c, "run_1").get_status("call_1")
+
+        with pytest.raises(PlatformError) as info:
+            asyncio.run(call())
+        assert info.value.code == "timeout"
+
+    def test_error_mid_stream(self):
+        events = []
+
+        def handler(request):
+            return httpx.Response(200, stream=_FailingStream())
+
+        async def call():
+            async with mock_client(handler) as c:
+                async for event in AgentClient(c, "run_1").invoke("echo", {"role": "user"}):
+                    events.append(event)
+
+        with pytest.raises(PlatformError) as info:
+            asyncio.run(call())
+        assert info.value.code == "transport_error"
+        assert events == [{"type": "delta", "data": {"text": "hi"}}]
+
+
+def tool_call_chunk(choice_index: int, index: int, arguments: str, **extra) -> dict:
+    tool_call = {"index": index, "function": {"arguments": arguments}}
+    tool_call.update(extra)
+    return {"choices": [{"index": choice_index, "delta": {"tool_calls": [tool_call]}}]}
+
+
+class TestToolCallDeltas:
+    def test_fragments_are_keyed_by_choice_and_tool_call_index(self):
+        calls = {}
+        chunks = [
+            tool_call_chunk(0, 0, '{"city": "Bei', id="call_a"),
+            tool_call_chunk(0, 1, '{"q": ', id="call_b"),
+            tool_call_chunk(1, 0, '{"x": 1', id="call_c"),
+            tool_call_chunk(0, 0, 'jing"}'),
+            tool_call_chunk(0, 1, '"weather"}'),
+            tool_call_chunk(1, 0, "}"),
+        ]
+        events = [event for chunk in chunks for event in _tool_call_deltas(chunk, calls)]
+
+        assert [event["id"] for event in events] == [
+            "call_a",
+            "call_b",
+            "call_c",
+            "call_a",
+            "call_b",
+            "call_c",
+        ]
+        assert set(calls) == {(0, 0), (0, 1), (1, 0)}
+        assert calls[(0, 0)].parser.value == {"city": "Beijing"}
+        assert calls[(0, 1)].parser.value == {"q": "weather"}
+        assert calls[(1, 0)].parser.value == {"x": 1}
+
+    def test_event_shape(self):
+        calls = {}
+        first = tool_call_chunk(0, 0, "", id="call_a")
+        first["choices"][0]["delta"]["tool_calls"][0]["function"]["name"] = "weather.query"
+        assert list(_tool_call_deltas(first, calls)) == []
+        assert list(_tool_call_deltas(tool_call_chunk(0, 0, '{"city": "B'), calls)) == [
+            {
+                "type": "tool_call_delta",
+                "id": "call_a",
+                "name": "weather.query",
+                "partial_args": {"city": "B"},
+            }
+        ]
+
+    def test_chunks_without_tool_calls_yield_nothing(self):
+        calls = {}
+        assert list(_tool_call_deltas({"choices": [{"delta": {"content": "hi"}}]}, calls)) == []
+        assert list(_tool_call_deltas({"choices": []}, calls)) == []
+        assert calls == {}
+
+    def test_malformed_arguments_stop_parsing_that_call_only(self):
+        calls = {}
+        assert list(_tool_call_deltas(tool_call_chunk(0, 0, "{]", id="bad"), calls)) == []
+        assert list(_tool_call_deltas(tool_call_chunk(0, 0, '"more"'), calls)) == []
+        events = list(_tool_call_deltas(tool_call_chunk(0, 1, '{"ok": true}', id="good"), calls))
+        assert [event["partial_args"] for event in events] == [{"ok": True}]
+
+
+class _AgentsHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep connections alive so the pool reuses them
+
+    def do_GET(self):
+        body = b'{"agents": []}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def orchestrator_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _AgentsHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+class TestSharedPool:
+    def test_clients_on_one_loop_share_a_pool(self):
+        async def run():
+            try:
+                first = PlatformClient.from_shared("http://orchestrator/", "run_1")
+                second = PlatformClient.from_shared("http://orchestrator", "run_2")
+                other_timeout = PlatformClient.from_shared("http://orchestrator", "run_3", 5.0)
+                assert first._client is second._client
+                assert other_timeout._client is not first._client
+            finally:
+                await PlatformClient.shutdown_shared()
+
+        asyncio.run(run())
+
+    def test_close_leaves_pool_open_and_shutdown_closes_it(self):
+        async def run():
+            client = PlatformClient.from_shared("http://orchestrator", "run_1")
+            http_client = client._client
+            await client.close()
+            assert not http_client.is_closed
+            assert PlatformClient.from_shared("http://orchestrator", "run_2")._client is http_client
+
+            await PlatformClient.shutdown_shared()
+            assert http_client.is_closed
+            fresh = PlatformClient.from_shared("http://orchestrator", "run_3")._client
+            assert fresh is not http_client
+            await PlatformClient.shutdown_shared()
+
+        asyncio.run(run())
+
+    def test_new_event_loop_gets_a_fresh_pool(self, orchestrator_url):
+        async def list_agents():
+            client = PlatformClient.from_shared(orchestrator_url, "run_1")
+            assert await client.agents.list_agents() == []
+            return client._client
+
+        try:
+            first = asyncio.run(list_agents())
+            second = asyncio.run(list_agents())
+            assert second is not first
+        finally:
+            asyncio.run(PlatformClient.shutdown_shared())
+
+
+class TestClose:
+    def test_close_twice_is_harmless(self):
+        async def run():
+            client = PlatformClient("http://orchestrator", "run_1")
+            await client.close()
+            assert client._client.is_closed
+            await client.close()
+
+        asyncio.run(run())
+
+    def test_unclosed_owned_pool_is_closed_when_collected(self):
+        async def run():
+            client = PlatformClient("http://orchestrator", "run_1")
+            http_client = client._client
+            del client
+            gc.collect()
+            # The finalizer schedules aclose on the loop; let it run
+            for _ in range(3):
+                await asyncio.sleep(0)
+            return http_client
+
+        assert asyncio.run(run()).is_closed
+
+    def test_close_detaches_finalizer(self):
+        async def run():
+            client = PlatformClient("http://orchestrator", "run_1")
+            await client.close()
+            assert not client._finalizer.alive
+
+        asyncio.run(run())
+
+    def test_client_created_outside_a_loop_registers_no_finalizer(self):
+        client = PlatformClient("http://orchestrator", "run_1")
+        assert client._finalizer is None
+        asyncio.run(client.close())
+
+    def test_shared_clients_register_no_finalizer(self):
+        async def run():
+            try:
+                client = PlatformClient.from_shared("http://orchestrator", "run_1")
+                assert client._finalizer is None
+                http_client = client._client
+                del client
+                gc.collect()
+                await asyncio.sleep(0)
+                assert not http_client.is_closed
+            finally:
+                await PlatformClient.shutdown_shared()
+
+        asyncio.run(run())
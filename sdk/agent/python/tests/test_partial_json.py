@@ -0,0 +1,109 @@
+"""Tests for the incremental JSON parser."""
+
+import json
+import random
+
+import pytest
+
+from agent_sdk._partial_json import PartialJSONParser
+
+DOCUMENTS = [
+    {"city": "Beijing", "days": 3},
+    {
+        "text": 'quote " backslash \\ newline \n tab \t slash /',
+        "numbers": [0, -1, 2.5, -3.25e-3, 1e10, 12345678901234567890],
+        "literals": [True, False, None],
+        "nested": {"empty_object": {}, "empty_list": [], "deep": [[[{"a": [1]}]]]},
+        "unicode": "caf\u00e9 \u4e2d\u6587 \U0001f600",
+    },
+    [1, [2, [3, []]], {"k": "v"}],
+    [],
+    {},
+    "just a string",
+]
+
+
+def feed_split(text: str, sizes) -> PartialJSONParser:
+    parser = PartialJSONParser()
+    i = 0
+    for size in sizes:
+        parser.feed(text[i : i + size])
+        i += size
+    parser.feed(text[i:])
+    return parser
+
+
+class TestPartialJSONParser:
+    @pytest.mark.parametrize("document", DOCUMENTS)
+    @pytest.mark.parametrize("ensure_ascii", [True, False])
+    def test_random_splits_match_json_loads(self, document, ensure_ascii):
+        text = json.dumps(document, ensure_ascii=ensure_ascii, indent=1)
+        rng = random.Random(0)
+        for _ in range(50):
+            sizes = [rng.randint(1, 5) for _ in range(len(text))]
+            assert feed_split(text, sizes).value == json.loads(text)
+
+    @pytest.mark.parametrize("document", DOCUMENTS)
+    def test_one_character_at_a_time(self, document):
+        text = json.dumps(document)
+        assert feed_split(text, [1] * len(text)).value == json.loads(text)
+
+    def test_partial_values(self):
+        parser = PartialJSONParser()
+        parser.feed('{"path": "/tmp/fo')
+        assert parser.value == {"path": "/tmp/fo"}
+        parser.feed('o", "n": 1')
+        # An unfinished number is left out until it completes
+        assert parser.value == {"path": "/tmp/foo"}
+        parser.feed('2, "tags": ["a", "b')
+        assert parser.value == {"path": "/tmp/foo", "n": 12, "tags": ["a", "b"]}
+        parser.feed('c"]}')
+        assert parser.value == {"path": "/tmp/foo", "n": 12, "tags": ["a", "bc"]}
+
+    def test_partial_args_are_updated_in_place(self):
+        parser = PartialJSONParser()
+        parser.feed('{"a": [1, ')
+        value = parser.value
+        parser.feed("2]}")
+        assert value is parser.value
+        assert value == {"a": [1, 2]}
+
+    @pytest.mark.parametrize("cut", range(1, 6))
+    def test_unicode_escape_split_across_fragments(self, cut):
+        text = '{"s": "x\\u00e9y"}'
+        start = text.index("\\")
+        assert feed_split(text, [start + cut]).value == {"s": "x\u00e9y"}
+
+    def test_surrogate_pair_split_across_fragments(self):
+        text = json.dumps({"emoji": "a\U0001f600b"})
+        assert "\\ud83d\\ude00" in text
+        for cut in range(len(text)):
+            assert feed_split(text, [cut]).value == {"emoji": "a\U0001f600b"}
+
+    def test_escaped_quote_and_backslash_split_across_fragments(self):
+        text = json.dumps({"s": 'a\\"b'})
+        for cut in range(len(text)):
+            assert feed_split(text, [cut]).value == {"s": 'a\\"b'}
+
+    @pytest.mark.parametrize(
+        "text",
+        [
+            '{"a" 1}',
+            '{"a": 1,}',
+            "[1,]",
+            "[1 2]",
+            '{"a": 1]',
+            "[1}",
+            "{1: 2}",
+            '{"a": tru}',
+            '{"a": nul,',
+            '{"a": 01,',
+            '"bad \\q escape"',
+            '"bad \\u12g4"',
+            "{} {}",
+            "}",
+        ],
+    )
+    def test_malformed_input_raises_value_error(self, text):
+        with pytest.raises(ValueError):
+            feed_split(text, [len(text) // 2])
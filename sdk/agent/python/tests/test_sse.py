@@ -0,0 +1,115 @@
+"""Tests for the SSE helpers."""
+
+import asyncio
+import json
+
+from agent_sdk.sse import SSEResponse, format_sse_event, sse_state, stream_text
+
+
+def split_event(event: bytes) -> tuple[str, object]:
+    header, data, rest = event.decode().split("\n", 2)
+    assert header.startswith("event: ") and data.startswith("data: ") and rest == "\n"
+    return header[len("event: ") :], json.loads(data[len("data: ") :])
+
+
+def test_format_sse_event_stringifies_non_str_keys():
+    event = format_sse_event("state", {"counts": {1: "x", 2.5: "y", None: "z"}})
+    assert split_event(event) == ("state", {"counts": {"1": "x", "2.5": "y", "null": "z"}})
+
+
+def test_sse_state_with_nested_non_str_keys():
+    event = sse_state("tool", {"counts": {1: "x"}})
+    assert split_event(event) == ("state", {"state": "tool", "detail": {"counts": {"1": "x"}}})
+
+
+class TestBufferedDelta:
+    def test_buffers_until_min_chars(self):
+        sse = SSEResponse(run_id="r1")
+        assert sse.buffered_delta("abc", min_chars=6) is None
+        assert sse.buffered_delta("de", min_chars=6) is None
+        event = sse.buffered_delta("f", min_chars=6)
+        assert split_event(event) == ("delta", {"text": "abcdef", "run_id": "r1"})
+
+    def test_single_chunk_over_threshold_is_sent_at_once(self):
+        sse = SSEResponse()
+        event = sse.buffered_delta("x" * 300)
+        assert split_event(event) == ("delta", {"text": "x" * 300})
+
+    def test_flush_returns_none_when_empty(self):
+        sse = SSEResponse()
+        assert sse.flush() is None
+        sse.buffered_delta("")
+        assert sse.flush() is None
+
+    def test_flush_emits_remainder_and_resets(self):
+        sse = SSEResponse()
+        assert sse.buffered_delta("abc", min_chars=6) is None
+        assert split_event(sse.flush()) == ("delta", {"text": "abc"})
+        assert sse.flush() is None
+        # The threshold counts from zero again after a flush
+        assert sse.buffered_delta("defgh", min_chars=6) is None
+        assert split_event(sse.buffered_delta("i", min_chars=6)) == ("delta", {"text": "defghi"})
+
+
+def run_stream_text(monkeypatch, **kwargs) -> list:
+    """Run stream_text on a fake clock that only advances when it sleeps."""
+    now = 0.0
+
+    async def sleep(seconds):
+        nonlocal now
+        now += seconds
+
+    monkeypatch.setattr(asyncio, "sleep", sleep)
+
+    async def collect():
+        monkeypatch.setattr(asyncio.get_running_loop(), "time", lambda: now)
+        return [split_event(event) async for event in stream_text(**kwargs)]
+
+    return asyncio.run(collect())
+
+
+def deltas(events: list) -> list[str]:
+    assert events[-1] == ("done", {"final_message": "abcdefghij"})
+    return [data["text"] for event_type, data in events[:-1] if event_type == "delta"]
+
+
+class TestStreamText:
+    def test_one_delta_per_chunk_by_default(self, monkeypatch):
+        events = run_stream_text(monkeypatch, text="abcdefghij", chunk_size=4, delay_ms=10)
+        assert deltas(events) == ["abcd", "efgh", "ij"]
+
+    def test_chunks_within_window_are_batched(self, monkeypatch):
+        events = run_stream_text(
+            monkeypatch, text="abcdefghij", chunk_size=2, delay_ms=10, max_chunk_batch_ms=25
+        )
+        # The batch closes on the first chunk at or past 25ms (t=30ms); the
+        # remainder is flushed before done
+        assert deltas(events) == ["abcdefgh", "ij"]
+
+    def test_batch_is_sent_at_max_batch_chars(self, monkeypatch):
+        events = run_stream_text(
+            monkeypatch,
+            text="abcdefghij",
+            chunk_size=2,
+            delay_ms=100,
+            max_chunk_batch_ms=10_000,
+            max_batch_chars=4,
+        )
+        assert deltas(events) == ["abcd", "efgh", "ij"]
+
+    def test_zero_delay_is_capped_by_max_batch_chars(self, monkeypatch):
+        events = run_stream_text(
+            monkeypatch,
+            text="abcdefghij",
+            chunk_size=2,
+            delay_ms=0,
+            max_chunk_batch_ms=50,
+            max_batch_chars=6,
+        )
+        assert deltas(events) == ["abcdef", "ghij"]
+
+    def test_run_id_is_included(self, monkeypatch):
+        events = run_stream_text(
+            monkeypatch, text="abcdefghij", run_id="r1", chunk_size=10, delay_ms=0
+        )
+        assert events[0] == ("delta", {"text": "abcdefghij", "run_id": "r1"})